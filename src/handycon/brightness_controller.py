@@ -76,7 +76,7 @@ class BrightnessController:
             )
             self.set_display_brightness(value)
         except Exception as error:
-            logger.debug(f'Cant assign new value: {type(error)}{error}')
+            logger.debug('Cant assign new value: %s%s', type(error), error)
             return False
 
     def increase_screen_brightness(self, value: int = 10):
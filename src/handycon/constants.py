@@ -12,6 +12,7 @@ from pathlib import Path
 CHIMERA_LAUNCHER_PATH = Path('/usr/share/chimera/bin/chimera-web-launcher')
 CONFIG_DIR = Path("/etc/handygccs/")
 CONFIG_PATH = CONFIG_DIR / "handygccs.conf"
+CONFIG_CACHE_PATH = CONFIG_DIR / "handygccs.cache.pkl"
 CONTROLLER_EVENTS: dict[
     int,
     Union[
@@ -206,99 +207,105 @@ CONTROLLER_EVENTS: dict[
     ],
 }
 DETECT_DELAY: float = 0.5
-EVENT_ALT_ENTER: list[list[int]] = [
-    [e.EV_KEY, e.KEY_LEFTALT],
-    [e.EV_KEY, e.KEY_ENTER]
-]
-EVENT_ALT_TAB: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.KEY_LEFTALT],
-    [e.EV_KEY, e.KEY_TAB]
-]
-EVENT_ESC: list[
-    list[int]
-] = [
-    [e.EV_MSC, e.MSC_SCAN],
-    [e.EV_KEY, e.KEY_ESC]
-]
-EVENT_KILL: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.KEY_LEFTMETA],
-    [e.EV_KEY, e.KEY_LEFTCTRL],
-    [e.EV_KEY, e.KEY_ESC]
-]
-EVENT_MODE: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_MODE]
-]
-EVENT_OPEN_CHIM: list[str] = [
-    "Open Chimera"
-]
-EVENT_OSK: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_MODE],
-    [e.EV_KEY, e.BTN_NORTH]
-]
-EVENT_OSK_DE: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.KEY_LEFTMETA],
-    [e.EV_KEY, e.KEY_LEFTCTRL],
-    [e.EV_KEY, e.KEY_O]
-]
-EVENT_QAM: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_MODE],
-    [e.EV_KEY, e.BTN_SOUTH]
-]
-EVENT_SCR: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_MODE],
-    [e.EV_KEY, e.BTN_TR]
-]
-EVENT_BTN_A: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_A]
-]
-EVENT_BTN_B: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_B]
-]
-EVENT_BTN_X: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_X]
-]
-EVENT_BTN_Y: list[
-    list[int]
-] = [
-    [e.EV_KEY, e.BTN_Y]
-]
-EVENT_TOGGLE_GYRO: list[str] = ["Toggle Gyro"]
-EVENT_TOGGLE_MOUSE: list[str] = ["Toggle Mouse Mode"]
-EVENT_TOGGLE_PERF: list[str] = ["Toggle Performance"]
+EVENT_ALT_ENTER: tuple[tuple[int, int], ...] = (
+    (e.EV_KEY, e.KEY_LEFTALT),
+    (e.EV_KEY, e.KEY_ENTER)
+)
+EVENT_ALT_TAB: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.KEY_LEFTALT),
+    (e.EV_KEY, e.KEY_TAB)
+)
+EVENT_ESC: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_MSC, e.MSC_SCAN),
+    (e.EV_KEY, e.KEY_ESC)
+)
+EVENT_KILL: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.KEY_LEFTMETA),
+    (e.EV_KEY, e.KEY_LEFTCTRL),
+    (e.EV_KEY, e.KEY_ESC)
+)
+EVENT_MODE: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_MODE),
+)
+EVENT_OPEN_CHIM: tuple[str, ...] = (
+    "Open Chimera",
+)
+EVENT_OSK: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_MODE),
+    (e.EV_KEY, e.BTN_NORTH)
+)
+EVENT_OSK_DE: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.KEY_LEFTMETA),
+    (e.EV_KEY, e.KEY_LEFTCTRL),
+    (e.EV_KEY, e.KEY_O)
+)
+EVENT_QAM: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_MODE),
+    (e.EV_KEY, e.BTN_SOUTH)
+)
+EVENT_SCR: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_MODE),
+    (e.EV_KEY, e.BTN_TR)
+)
+EVENT_BTN_A: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_A),
+)
+EVENT_BTN_B: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_B),
+)
+EVENT_BTN_X: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_X),
+)
+EVENT_BTN_Y: tuple[
+    tuple[int, int], ...
+] = (
+    (e.EV_KEY, e.BTN_Y),
+)
+EVENT_TOGGLE_GYRO: tuple[str, ...] = ("Toggle Gyro",)
+EVENT_TOGGLE_MOUSE: tuple[str, ...] = ("Toggle Mouse Mode",)
+EVENT_TOGGLE_PERF: tuple[str, ...] = ("Toggle Performance",)
 
-POWER_ACTION_HIBERNATE: list[str] = ["Hibernate"]
-POWER_ACTION_SHUTDOWN: list[str] = ["Shutdown"]
-POWER_ACTION_SUSPEND: list[str] = ["Suspend"]
+POWER_ACTION_HIBERNATE: tuple[str, ...] = ("Hibernate",)
+POWER_ACTION_SHUTDOWN: tuple[str, ...] = ("Shutdown",)
+POWER_ACTION_SUSPEND: tuple[str, ...] = ("Suspend",)
 POWER_ACTION_MAP: dict[
     Literal["HIBERNATE", "SHUTDOWN", "SUSPEND"],
-    list[str]
+    tuple[str, ...]
 ] = {
     "HIBERNATE": POWER_ACTION_HIBERNATE,
     "SHUTDOWN":  POWER_ACTION_SHUTDOWN,
     "SUSPEND":   POWER_ACTION_SUSPEND,
 }
+# Power action -> systemctl argv, no shell involved.
+SYSTEMCTL_ARGV: dict[str, tuple[str, ...]] = {
+    "Hibernate": ("systemctl", "hibernate"),
+    "Shutdown":  ("systemctl", "poweroff"),
+    "Suspend":   ("systemctl", "suspend"),
+}
 
-EVENT_MAP: dict[str, list[list[int]]] = {
+EVENT_MAP: dict[str, tuple] = {
     "ALT_TAB": EVENT_ALT_TAB,
     "ESC": EVENT_ESC,
     "KILL": EVENT_KILL,
@@ -314,14 +321,14 @@ EVENT_MAP: dict[str, list[list[int]]] = {
     "HIBERNATE": POWER_ACTION_HIBERNATE,
     "SHUTDOWN": POWER_ACTION_SHUTDOWN
 }
-INSTANT_EVENTS: list[list[list[int]]] = [
+INSTANT_EVENTS: frozenset[tuple] = frozenset((
     EVENT_MODE,
     EVENT_OPEN_CHIM,
     EVENT_TOGGLE_GYRO,
     EVENT_TOGGLE_MOUSE,
     EVENT_TOGGLE_PERF
-]
-QUEUED_EVENTS: list[list[list[int]]] = [
+))
+QUEUED_EVENTS: frozenset[tuple] = frozenset((
     EVENT_ALT_TAB,
     EVENT_ESC,
     EVENT_KILL,
@@ -329,9 +336,16 @@ QUEUED_EVENTS: list[list[list[int]]] = [
     EVENT_OSK_DE,
     EVENT_QAM,
     EVENT_SCR
-]
+))
 FF_DELAY: float = 0.2
+# Codes forwarded to the virtual controller as-is,
+# without chord evaluation in process_event.
+PASSTHROUGH_CODES: frozenset[int] = frozenset({
+    e.KEY_VOLUMEDOWN,
+    e.KEY_VOLUMEUP,
+})
 HIDE_PATH: Path = Path("/dev/input/.hidden/")
+HIDE_PATH_STR: str = str(HIDE_PATH)
 HOME_PATH: Path = Path('/home')
 JOY_MAX: int = 32767
 JOY_MIN: int = -32767
@@ -1,26 +1,29 @@
 import os
-import re
+import pwd
 import time
+import pickle
+import asyncio
+import struct
 import logging
-import subprocess
 import configparser
 
-import usb1
+import pyudev
 
 from typing import Optional, Literal
 from pathlib import Path
 
 from .constants import \
     HIDE_PATH, \
+    HIDE_PATH_STR, \
     CHIMERA_LAUNCHER_PATH, \
     CONFIG_DIR, \
     CONFIG_PATH, \
+    CONFIG_CACHE_PATH, \
     EVENT_MAP, \
     POWER_ACTION_MAP, \
+    SYSTEMCTL_ARGV, \
     DETECT_DELAY
 
-from .back_paddles import replay, open_dev
-
 # Partial imports
 from evdev import \
     InputEvent, \
@@ -31,18 +34,31 @@ from evdev import \
 logger = logging.getLogger('handycon')
 
 
+# struct utmp layout from <utmp.h> (glibc, x86_64).
+UTMP_PATH = Path('/var/run/utmp')
+UTMP_RECORD = struct.Struct('<h2xi32s4s32s256s2hi2i16s20s')
+USER_PROCESS = 7
+
+# Bump when the pickled cache layout changes
+# (v2: button_map values are tuples).
+CACHE_VERSION = 2
+
+
 class DeviceExplorer:
     # Session Variables
     config: Optional[configparser.ConfigParser] = None
-    button_map: dict[str, list[list[int]]] = {}
+    button_map: dict[str, tuple] = {}
 
     # Enviroment Variables
     HAS_CHIMERA_LAUNCHER: bool = False
     USER: Optional[str] = None
+    UID: Optional[int] = None
+    GID: Optional[int] = None
     HOME_PATH: Optional[Path] = None
 
     # Stores inng button presses to block spam
     power_action: Literal["Hibernate", "Suspend", "Shutdown"] = "Suspend"
+    power_argv: Optional[tuple[str, ...]] = SYSTEMCTL_ARGV["Suspend"]
 
     # Handheld Config
     system_type = "ALY_GEN1"
@@ -66,6 +82,10 @@ class DeviceExplorer:
     power_device: Optional[InputDevice] = None
     power_device_2: Optional[InputDevice] = None
 
+    # Shared evdev scan, see enumerate_devices.
+    _device_scan: list[InputDevice] = []
+    _device_scan_time: float = 0.0
+
     # Paths
     controller_event: Optional[str] = None
     controller_path: Optional[Path] = None
@@ -85,6 +105,10 @@ class DeviceExplorer:
             )
             exit()
         HIDE_PATH.mkdir(parents=True, exist_ok=True)
+        # Set while a physical controller is grabbed; the FF loop
+        # parks on it instead of polling while disconnected.
+        self.controller_ready = asyncio.Event()
+        self.udev_monitor = self.start_udev_monitor()
         self.restore_hidden()
         self.get_user()
         self.HAS_CHIMERA_LAUNCHER = CHIMERA_LAUNCHER_PATH.is_file()
@@ -109,6 +133,28 @@ class DeviceExplorer:
         )
         logger.warning('Method process_event not assigned right now!!!')
 
+    @staticmethod
+    def logged_in_users() -> list[tuple[int, str]]:
+        """
+        Parse utmp for active user sessions.
+        :return: (login time, username) pairs
+        """
+        try:
+            utmp_data = UTMP_PATH.read_bytes()
+        except OSError:
+            return []
+
+        users = []
+        size = len(utmp_data) - len(utmp_data) % UTMP_RECORD.size
+        for record in UTMP_RECORD.iter_unpack(utmp_data[:size]):
+            ut_type, ut_user, tv_sec = record[0], record[4], record[9]
+            if ut_type != USER_PROCESS:
+                continue
+            name = ut_user.rstrip(b'\x00').decode(errors='replace')
+            if name:
+                users.append((tv_sec, name))
+        return users
+
     def get_user(self) -> bool:
         """
         Capture the username
@@ -116,53 +162,66 @@ class DeviceExplorer:
         :return:
         """
         logger.debug("Identifying user.")
-        cmd = "who | awk '{print $1}' | sort | head -1"
         while self.USER is None:
-            USER_LIST = subprocess.Popen(
-                args=cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=True
-            )
-            for get_first in USER_LIST.stdout:
-                name = get_first.decode().strip()
-                if name is not None:
-                    self.USER = name
+            users = self.logged_in_users()
+            if users:
+                # Earliest login wins.
+                self.USER = min(users)[1]
                 break
-            time.sleep(1)
+            time.sleep(DETECT_DELAY)
 
-        logger.debug(f"USER: {self.USER}")
+        logger.debug("USER: %s", self.USER)
         self.HOME_PATH = Path("/home/") / self.USER
-        logger.debug(f"HOME_PATH: {self.HOME_PATH}")
+        logger.debug("HOME_PATH: %s", self.HOME_PATH)
+        try:
+            # Resolved once so user-scoped commands can drop
+            # privileges directly instead of shelling out to su.
+            user_record = pwd.getpwnam(self.USER)
+            self.UID = user_record.pw_uid
+            self.GID = user_record.pw_gid
+        except KeyError:
+            logger.warning("No passwd entry for %s.", self.USER)
         return True
 
-    @staticmethod
-    def get_cpu_vendor():
+    # CPU vendor never changes for the process lifetime.
+    _cpu_vendor: Optional[str] = None
+
+    @classmethod
+    def get_cpu_vendor(cls) -> Optional[str]:
         """
-        Getting cpu vendor
+        Getting cpu vendor from /proc/cpuinfo
         :return:
         """
-        cmd = "cat /proc/cpuinfo | egrep 'vendor_id'"
-        all_info = subprocess.check_output(cmd, shell=True).decode().strip()
-        for line in all_info.split("\n"):
-            if "vendor_id" in line:
-                return re.sub(".*vendor_id.*:", "", line, 1).strip()
+        if cls._cpu_vendor is None:
+            with open('/proc/cpuinfo') as cpuinfo:
+                for line in cpuinfo:
+                    if line.startswith('vendor_id'):
+                        cls._cpu_vendor = line.split(':', 1)[1].strip()
+                        break
+        return cls._cpu_vendor
 
     @staticmethod
     def is_process_running(name: str) -> bool:
         """
-        Checking if process with name running
+        Checking if process with name running.
+        Scans /proc directly instead of forking a
+        ps | egrep | egrep | wc pipeline.
         :param name: Process name
         :return:
         """
-        cmd = f"ps -Af | egrep '{name}' | egrep 'grep' -v | wc -l"
-        read_proc = os.popen(cmd).read()
-        proc_count = int(read_proc)
-        if proc_count > 0:
-            logger.debug(f'Process {name} is running.')
-            return True
-        logger.debug(f'Process {name} is NOT running.')
+        wanted = name.encode()
+        for proc in os.scandir('/proc'):
+            if not proc.name.isdigit():
+                continue
+            try:
+                comm = Path(proc.path, 'comm').read_bytes()
+            except OSError:
+                # Process exited mid-scan.
+                continue
+            if comm.strip() == wanted:
+                logger.debug('Process %s is running.', name)
+                return True
+        logger.debug('Process %s is NOT running.', name)
         return False
 
     @staticmethod
@@ -171,11 +230,13 @@ class DeviceExplorer:
         Deleting hidden events
         :return:
         """
-        for hidden_event in HIDE_PATH.iterdir():
-            logger.debug(f'Restoring {hidden_event}')
-            hidden_event.rename(
-                Path("/dev/input/") / hidden_event
-            )
+        with os.scandir(HIDE_PATH) as hidden_events:
+            for hidden_event in hidden_events:
+                logger.debug('Restoring %s', hidden_event.name)
+                os.rename(
+                    hidden_event.path,
+                    os.path.join('/dev/input/', hidden_event.name)
+                )
 
     def map_config(self):
         """
@@ -189,6 +250,7 @@ class DeviceExplorer:
         self.power_action = POWER_ACTION_MAP[
             self.config["Button Map"]["power_button"]
         ][0]
+        self.power_argv = SYSTEMCTL_ARGV.get(self.power_action)
 
     # Sets the default configuration.
     def set_default_config(self):
@@ -226,6 +288,49 @@ class DeviceExplorer:
             self.config.write(config_file)
             logger.info(f"Created new config: {CONFIG_PATH}")
 
+    def load_config_cache(self) -> bool:
+        """
+        Load pre-resolved button_map/power_action from the pickle
+        cache if it is at least as new as the config file.
+        :return:
+        """
+        try:
+            if CONFIG_CACHE_PATH.stat().st_mtime \
+                    < CONFIG_PATH.stat().st_mtime:
+                return False
+            with CONFIG_CACHE_PATH.open(mode='rb') as cache_file:
+                cached = pickle.load(cache_file)
+            if cached.get('version') != CACHE_VERSION:
+                return False
+            self.button_map = cached['button_map']
+            self.power_action = cached['power_action']
+            self.power_argv = SYSTEMCTL_ARGV.get(self.power_action)
+            return True
+        except (OSError, pickle.PickleError, KeyError):
+            return False
+
+    def write_config_cache(self):
+        """
+        Write the resolved button_map/power_action next to the config
+        so the next start can skip the INI parser. Written atomically,
+        best effort.
+        :return:
+        """
+        try:
+            tmp_path = CONFIG_CACHE_PATH.with_suffix('.tmp')
+            with tmp_path.open(mode='wb') as cache_file:
+                pickle.dump(
+                    {
+                        'version': CACHE_VERSION,
+                        'button_map': self.button_map,
+                        'power_action': self.power_action,
+                    },
+                    cache_file
+                )
+            tmp_path.rename(CONFIG_CACHE_PATH)
+        except OSError as error:
+            logger.debug('Cant write config cache: %s', error)
+
     def get_config(self):
         """
         Getting config from /etc/handygccs/handygccs.conf
@@ -235,6 +340,12 @@ class DeviceExplorer:
         self.config = configparser.ConfigParser()
 
         if CONFIG_PATH.exists():
+            if self.load_config_cache():
+                logger.info(
+                    f"Loaded cached config: {CONFIG_CACHE_PATH}"
+                )
+                return
+
             logger.info(f"Loading existing config: {CONFIG_PATH}")
             self.config.read(CONFIG_PATH)
 
@@ -250,6 +361,7 @@ class DeviceExplorer:
             self.write_config()
 
         self.map_config()
+        self.write_config_cache()
 
     @staticmethod
     def init_handheld():
@@ -258,6 +370,11 @@ class DeviceExplorer:
         :param handycon:
         :return:
         """
+        # Runs once per boot; the USB replay blob and libusb are
+        # only loaded here instead of at import time.
+        import usb1
+
+        from .back_paddles import replay, open_dev
 
         with usb1.USBContext() as usb_context:
             dev = open_dev(0x0b05, 0x1abe, usb_context)
@@ -277,7 +394,7 @@ class DeviceExplorer:
         system_id = Path(
             "/sys/devices/virtual/dmi/id/product_name").read_text().strip()
         cpu_vendor = self.get_cpu_vendor()
-        logger.debug(f"Found CPU Vendor: {cpu_vendor}")
+        logger.debug("Found CPU Vendor: %s", cpu_vendor)
 
         self.init_handheld()
 
@@ -286,63 +403,41 @@ class DeviceExplorer:
             f"and configured defaults for {self.system_type}."
         )
 
-    def get_controller(self) -> bool:
+    @staticmethod
+    def start_udev_monitor() -> Optional[pyudev.Monitor]:
         """
-        Getting controller device
+        Start a netlink monitor on the input subsystem so the capture
+        loops can wait for a device to actually appear instead of
+        rescanning /dev/input on a timer.
         :return:
         """
-        # Identify system input event devices.
-        logger.debug(f"Attempting to grab {self.GAMEPAD_NAME}.")
         try:
-            devices_original = [InputDevice(path) for path in list_devices()]
+            context = pyudev.Context()
+            monitor = pyudev.Monitor.from_netlink(context)
+            monitor.filter_by('input')
+            monitor.start()
+            return monitor
         except Exception as error:
-            logger.error(
-                "Error when scanning event devices. Restarting scan."
-            )
-            logger.exception(error)
-            time.sleep(DETECT_DELAY)
-            return False
-
-        # Grab the built-in devices.
-        # This will give us exclusive acces to the devices
-        # and their capabilities.
-        for device in devices_original:
-            if device.name == self.GAMEPAD_NAME \
-                    and device.phys == self.GAMEPAD_ADDRESS:
-                self.controller_path = Path(device.path)
-                self.controller_device = InputDevice(
-                    self.controller_path
-                )
-                if self.CAPTURE_CONTROLLER:
-                    self.controller_device.grab()
-                    self.controller_event = self.controller_path.name
-                    self.controller_path.rename(
-                        HIDE_PATH / self.controller_event
-                    )
-                break
-
-        # Sometimes the service loads
-        # before all input devices have full initialized. Try a few times.
-        if not self.controller_device:
             logger.warning(
-                "Controller device not yet found. Restarting scan."
-            )
-            time.sleep(DETECT_DELAY)
-            return False
-        else:
-            logger.info(
-                f"Found {self.controller_device.name}. "
-                f"Capturing input data."
+                "udev monitor unavailable. Falling back to polling."
             )
-            return True
+            logger.exception(error)
+            return None
 
-    def get_keyboard(self) -> bool:
+    def enumerate_devices(self) -> Optional[list[InputDevice]]:
         """
-        Getting keyboard
+        Identify system input event devices.
+        Every scan opens each /dev/input/event* node and issues
+        several ioctls, so one recent result is shared between the
+        controller/keyboard/power getters instead of enumerating
+        four times per detect pass.
         :return:
         """
-        # Identify system input event devices.
-        logger.debug(f"Attempting to grab {self.KEYBOARD_NAME}.")
+        now = time.monotonic()
+        if DeviceExplorer._device_scan \
+                and now - DeviceExplorer._device_scan_time < DETECT_DELAY:
+            return DeviceExplorer._device_scan
+
         try:
             devices_original = [InputDevice(path) for path in list_devices()]
         except Exception as error:
@@ -351,84 +446,136 @@ class DeviceExplorer:
             )
             logger.exception(error)
             time.sleep(DETECT_DELAY)
+            return None
+
+        # Free the fds of the previous scan, except devices we
+        # grabbed from it.
+        for device in DeviceExplorer._device_scan:
+            if device is self.power_device \
+                    or device is self.power_device_2:
+                continue
+            try:
+                device.close()
+            except Exception:
+                pass
+
+        DeviceExplorer._device_scan = devices_original
+        DeviceExplorer._device_scan_time = now
+        return devices_original
+
+    def grab_device(
+            self,
+            slot: str,
+            wanted_name: str,
+            wanted_phys: str,
+            capture: bool
+    ) -> bool:
+        """
+        Scan evdev devices for (name, phys), claim the match into
+        self.<slot>_device / _event / _path and hide its node.
+        One generic sweep instead of a copy per device kind.
+        :param slot: attribute prefix to assign
+        :param wanted_name: evdev device name
+        :param wanted_phys: evdev physical address
+        :param capture: grab the device and hide its node
+        :return:
+        """
+        # Identify system input event devices.
+        logger.debug("Attempting to grab %s.", wanted_name)
+        devices_original = self.enumerate_devices()
+        if devices_original is None:
             return False
+
         # Grab the built-in devices.
         # This will give us exclusive acces to the devices
         # and their capabilities.
         for device in devices_original:
-            logger.debug(f"{device.name}, {device.phys}")
-            if device.name == self.KEYBOARD_NAME \
-                    and device.phys == self.KEYBOARD_ADDRESS:
-                self.keyboard_path = Path(device.path)
-                self.keyboard_device = InputDevice(self.keyboard_path)
-                if self.CAPTURE_KEYBOARD:
-                    self.keyboard_device.grab()
-                    self.keyboard_event = self.keyboard_path.name
-                    self.keyboard_path.rename(
-                        HIDE_PATH / self.keyboard_event
+            logger.debug("%s, %s", device.name, device.phys)
+            if device.name == wanted_name \
+                    and device.phys == wanted_phys:
+                # The scan is cached for up to DETECT_DELAY, so the
+                # node can be gone again on a hotplug flap; a raise
+                # here would kill the calling capture task.
+                claimed = None
+                try:
+                    claimed = InputDevice(device.path)
+                    if capture:
+                        claimed.grab()
+                        event = os.path.basename(device.path)
+                        os.rename(
+                            device.path,
+                            os.path.join(HIDE_PATH_STR, event)
+                        )
+                        setattr(self, f'{slot}_event', event)
+                except OSError as err:
+                    logger.warning(
+                        "%s | Failed to claim %s.", err, wanted_name
                     )
+                    if claimed is not None:
+                        try:
+                            claimed.close()
+                        except OSError:
+                            pass
+                    # Stale cache entry: force a fresh scan next try.
+                    DeviceExplorer._device_scan_time = 0.0
+                    return False
+                setattr(self, f'{slot}_path', Path(device.path))
+                setattr(self, f'{slot}_device', claimed)
                 break
 
         # Sometimes the service loads
         # before all input devices have full initialized. Try a few times.
-        if not self.keyboard_device:
+        claimed = getattr(self, f'{slot}_device')
+        if not claimed:
             logger.warning(
-                "Keyboard device not yet found. Restarting scan.")
+                "%s device not yet found. Restarting scan.", wanted_name
+            )
             time.sleep(DETECT_DELAY)
             return False
         else:
             logger.info(
-                f"Found {self.keyboard_device.name}. Capturing input data."
+                f"Found {claimed.name}. Capturing input data."
             )
             return True
 
-    def get_keyboard_2(self) -> bool:
+    def get_controller(self) -> bool:
         """
-        Getting keyboard
+        Getting controller device
         :return:
         """
-        logger.debug(
-            f"Attempting to grab {self.KEYBOARD_2_NAME}.")
-        try:
-            devices_original = [InputDevice(path) for path in list_devices()]
-        except Exception as error:
-            logger.error(
-                "Error when scanning event devices. Restarting scan."
-            )
-            logger.exception(error)
-            time.sleep(DETECT_DELAY)
-            return False
+        grabbed = self.grab_device(
+            'controller',
+            self.GAMEPAD_NAME,
+            self.GAMEPAD_ADDRESS,
+            self.CAPTURE_CONTROLLER
+        )
+        if grabbed:
+            self.controller_ready.set()
+        return grabbed
 
-        # Grab the built-in devices.
-        # This will give us exclusive acces
-        # to the devices and their capabilities.
-        for device in devices_original:
-            logger.debug(f"{device.name}, {device.phys}")
-            if device.name == self.KEYBOARD_2_NAME \
-                    and device.phys == self.KEYBOARD_2_ADDRESS:
-                self.keyboard_2_path = Path(device.path)
-                self.keyboard_2_device = InputDevice(self.keyboard_2_path)
-                if self.CAPTURE_KEYBOARD:
-                    self.keyboard_2_device.grab()
-                    self.keyboard_2_event = self.keyboard_2_path.name
-                    self.keyboard_2_path.rename(
-                        HIDE_PATH / self.keyboard_2_event
-                    )
-                break
+    def get_keyboard(self) -> bool:
+        """
+        Getting keyboard
+        :return:
+        """
+        return self.grab_device(
+            'keyboard',
+            self.KEYBOARD_NAME,
+            self.KEYBOARD_ADDRESS,
+            self.CAPTURE_KEYBOARD
+        )
 
-        # Sometimes the service loads
-        # before all input devices have full initialized. Try a few times.
-        if not self.keyboard_2_device:
-            logger.warning(
-                "Keyboard device 2 not yet found. Restarting scan."
-            )
-            time.sleep(DETECT_DELAY)
-            return False
-        else:
-            logger.info(
-                f"Found {self.keyboard_2_device.name}. Capturing input data."
-            )
-            return True
+    def get_keyboard_2(self) -> bool:
+        """
+        Getting keyboard
+        :return:
+        """
+        return self.grab_device(
+            'keyboard_2',
+            self.KEYBOARD_2_NAME,
+            self.KEYBOARD_2_ADDRESS,
+            self.CAPTURE_KEYBOARD
+        )
 
     def get_powerkey(self):
         """
@@ -437,16 +584,10 @@ class DeviceExplorer:
         """
         logger.debug("Attempting to grab power buttons.")
         # Identify system input event devices.
-        try:
-            devices_original = [InputDevice(path) for path in list_devices()]
         # Some funky stuff happens sometimes when booting.
         # Give it another shot.
-        except Exception as error:
-            logger.error(
-                "Error when scanning event devices. Restarting scan."
-            )
-            logger.exception(error)
-            time.sleep(DETECT_DELAY)
+        devices_original = self.enumerate_devices()
+        if devices_original is None:
             return False
 
         # Grab the built-in devices.
@@ -462,7 +603,7 @@ class DeviceExplorer:
                     and not self.power_device:
                 self.power_device = device
                 logger.debug(
-                    f"found power device {self.power_device.phys}"
+                    "found power device %s", self.power_device.phys
                 )
                 if self.CAPTURE_POWER:
                     self.power_device.grab()
@@ -474,7 +615,8 @@ class DeviceExplorer:
                     and not self.power_device_2:
                 self.power_device_2 = device
                 logger.debug(
-                    f"found alternate power device {self.power_device_2.phys}"
+                    "found alternate power device %s",
+                    self.power_device_2.phys
                 )
                 if self.CAPTURE_POWER:
                     self.power_device_2.grab()
@@ -1,4 +1,5 @@
 import os
+import time
 import asyncio
 import logging
 import subprocess
@@ -29,9 +30,40 @@ from .notify_db import add_toast
 logger = logging.getLogger('handycon')
 
 
+# Fixed chords, independent of the user's button map. Keyed on the
+# sorted held-key tuple; the value pairs the closing seed code with
+# the UI action, since these only fire on their own key press.
+STRING_CHORDS: dict[tuple[int, ...], tuple[int, tuple[str, ...]]] = {
+    (186, 311): (186, ("Increase screen brightness",)),
+    (186, 310): (186, ("Decrease screen brightness",)),
+    (148, 311): (148, ("Increase led brightness",)),
+    (148, 310): (148, ("Decrease led brightness",)),
+    (148, 310, 311): (148, ("Switch led mode",)),
+    (186, 310, 311): (186, ("Toggle Performance",)),
+    (186, 307): (186, ("Open Keyboard",)),
+}
+
+# Back paddles forwarded as plain gamepad buttons, bypassing the
+# event queue entirely.
+DIRECT_PRESS_CHORDS: dict[tuple[int, ...], tuple] = {
+    (187,): EVENT_BTN_A,
+    (188,): EVENT_BTN_X,
+}
+DIRECT_RELEASE_CODES: dict[int, tuple] = {
+    187: EVENT_BTN_A,
+    188: EVENT_BTN_X,
+}
+
+
 class EventEmitter(DeviceExplorer):
-    # Stores inng button presses to block spam
-    event_queue: list[InputEvent] = []
+    # Stores inng button presses to block spam. Insertion-ordered
+    # dict used as an ordered set: membership is a hash probe, the
+    # first entry is the oldest queued chord.
+    event_queue: dict[tuple, None] = {}
+    # Currently held key codes across all captured devices,
+    # maintained from EV_KEY transitions. Re-seeded with
+    # sync_held_keys when a device comes or goes.
+    held_keys: set[int] = set()
     last_button: Optional[list[int]] = None
     last_x_val: int = 0
     last_y_val: int = 0
@@ -56,9 +88,17 @@ class EventEmitter(DeviceExplorer):
         },
     }
 
+    # Cached Steam DeckUI detection, keyed on the pid file mtime.
+    _steam_pidfile_mtime: int = 0
+    _steam_is_deckui: bool = False
+
     def __init__(self):
         DeviceExplorer.__init__(self)
         self.brightness = BrightnessController()
+        # HOME_PATH is resolved by get_user above, build the Steam
+        # paths once instead of per button press.
+        self.steam_pid_path = self.HOME_PATH / '.steam/steam.pid'
+        self.steam_binary_path = self.HOME_PATH / '.steam/root/ubuntu12_32/steam'
         self.ui_device = UInput(
             CONTROLLER_EVENTS,
             name='Handheld Controller',
@@ -68,6 +108,135 @@ class EventEmitter(DeviceExplorer):
             version=0x110
         )
         self.mode_generator = self.mode_gen()
+        # Rumble requests are handed to a dedicated writer task so
+        # the upload/erase ioctls never block event dispatch.
+        self.rumble_queue: asyncio.Queue = asyncio.Queue()
+        # Uploaded effect ids per rumble pattern; effect ids are
+        # only valid for the device they were uploaded to.
+        self.rumble_effects: dict[tuple[int, int, int, int], int] = {}
+        self.rumble_device = None
+        # The config is resolved by DeviceExplorer.__init__ above.
+        self.build_chord_tables()
+        # Last accepted press per chord, for debouncing.
+        self.press_times: dict[tuple, float] = {}
+        # String action -> handler, one dict probe per dispatch in
+        # emit_now. Coroutine results are awaited by the caller.
+        self.string_handlers = {
+            "Increase screen brightness":
+                lambda: self.brightness.increase_screen_brightness(25),
+            "Decrease screen brightness":
+                lambda: self.brightness.decrease_screen_brightness(25),
+            "Increase led brightness":
+                self.brightness.increase_led_brightness,
+            "Decrease led brightness":
+                self.brightness.decrease_led_brightness,
+            "Switch led mode":
+                self.brightness.switch_led_mode,
+            "Open Keyboard":
+                lambda: self.steam_ifrunning_deckui('steam://open/keyboard'),
+            "Open Chimera": self.launch_chimera,
+            "Toggle Gyro":
+                lambda: logger.debug(
+                    "Toggle Gyro is not currently enabled"
+                ),
+            "Toggle Mouse Mode":
+                lambda: logger.debug(
+                    "Toggle Mouse Mode is not currently enabled"
+                ),
+            "Toggle Performance": self.toggle_performance,
+        }
+
+    def build_chord_tables(self):
+        """
+        Precompute the chord dispatch tables from button_map so
+        process_event resolves presses and releases with dict
+        lookups instead of comparing every known chord.
+        :return:
+        """
+        bm = self.button_map
+        # Held-key chord -> (queued button, rumble on press).
+        # button1 (Default: Screenshot) Paddle + Y
+        # button2 (Default: QAM) Armory Crate Button Short Press
+        # button3 (Default: ESC) Paddle + X, triggers from KEYBOARD_2
+        # button4 (Default: OSK) Paddle + D-Pad UP
+        # button5 (Default: Mode) Control Center Short Press
+        # button6 (Default: Launch Chimera) Paddle + A
+        # button7 (Default: Toggle Performance) Armory Crate Button
+        #         Long Press is disabled: the firmware fires its own
+        #         F17/F18 down/up pairs around it
+        # button8 (Default: Mode) Control Center Long Press,
+        #         triggers from KEYBOARD_2, rumbles on queue
+        # button9 (Default: Toggle Mouse) Paddle + D-Pad DOWN
+        # button10 (Default: ALT+TAB) Paddle + D-Pad LEFT
+        # button11 (Default: KILL) Paddle + D-Pad RIGHT
+        # button12 (Default: Toggle Gyro) Paddle + B
+        self.press_chords: dict[tuple[int, ...], tuple] = {
+            (184,): (bm["button1"], False),
+            (148,): (bm["button2"], False),
+            (25, 125): (bm["button3"], False),
+            (88,): (bm["button4"], False),
+            (186,): (bm["button5"], False),
+            (68,): (bm["button6"], False),
+            (29, 56, 111): (bm["button8"], True),
+            (1, 29, 42): (bm["button9"], False),
+            (32, 125): (bm["button10"], False),
+            (15, 125): (bm["button11"], False),
+            (49, 125): (bm["button12"], False),
+        }
+        # Release seed code -> queued buttons it may close, in
+        # match priority order; the first one found in the queue
+        # wins.
+        self.release_codes: dict[int, tuple] = {
+            184: (bm["button1"],),
+            185: (bm["button1"], bm["button3"], bm["button4"],
+                  bm["button6"], bm["button9"], bm["button10"],
+                  bm["button11"], bm["button12"]),
+            148: (bm["button2"],),
+            49: (bm["button3"], bm["button12"]),
+            125: (bm["button3"], bm["button10"], bm["button11"],
+                  bm["button12"]),
+            88: (bm["button4"],),
+            186: (bm["button5"],),
+            68: (bm["button6"],),
+            29: (bm["button8"], bm["button9"]),
+            56: (bm["button8"],),
+            111: (bm["button8"],),
+            1: (bm["button9"],),
+            42: (bm["button9"],),
+            32: (bm["button10"],),
+            15: (bm["button11"],),
+            25: (bm["button12"],),
+        }
+
+    def sync_held_keys(self):
+        """
+        Re-seed the held key set from the devices' kernel state.
+        Called when a device is (re)grabbed or lost; between calls
+        the set is maintained from EV_KEY transitions with no ioctl.
+        :return:
+        """
+        self.held_keys.clear()
+        for device in (
+                self.keyboard_device,
+                self.keyboard_2_device,
+                self.controller_device
+        ):
+            if device:
+                try:
+                    self.held_keys.update(device.active_keys())
+                except OSError:
+                    pass
+
+    def track_key(self, event: InputEvent):
+        """
+        Apply one EV_KEY transition to the held key set.
+        :param event:
+        :return:
+        """
+        if event.value:
+            self.held_keys.add(event.code)
+        else:
+            self.held_keys.discard(event.code)
 
     def mode_gen(self):
         while True:
@@ -85,12 +254,14 @@ class EventEmitter(DeviceExplorer):
         :return:
         """
 
-        for event in events:
+        if not events:
+            return
+        # Pause between multiple events,
+        # but not after the last one in the list.
+        for event in events[:-1]:
             self.emit_event(event)
-            # Pause between multiple events,
-            # but not after the last one in the list.
-            if event != events[-1]:
-                await asyncio.sleep(self.BUTTON_DELAY)
+            await asyncio.sleep(self.BUTTON_DELAY)
+        self.emit_event(events[-1])
 
     def emit_event(self, event: InputEvent):
         """
@@ -100,7 +271,10 @@ class EventEmitter(DeviceExplorer):
         """
         # logger.debug(f"Emitting event: {event}")
         self.ui_device.write_event(event)
-        self.ui_device.syn()
+        # Forwarded controller streams carry their own SYN_REPORTs;
+        # syn() after one of those would emit a second, empty frame.
+        if event.type != e.EV_SYN:
+            self.ui_device.syn()
 
     async def emit_now(
             self,
@@ -132,73 +306,33 @@ class EventEmitter(DeviceExplorer):
                     "KEY_UP event not required. Skipping"
                 )
                 return
-            match event_list[0]:
-                case "Increase screen brightness":
-                    self.brightness.increase_screen_brightness(25)
-                case "Decrease screen brightness":
-                    self.brightness.decrease_screen_brightness(25)
-                case "Increase led brightness":
-                    self.brightness.increase_led_brightness()
-                case "Decrease led brightness":
-                    self.brightness.decrease_led_brightness()
-                case "Switch led mode":
-                    self.brightness.switch_led_mode()
-                case "Open Keyboard":
-                    self.steam_ifrunning_deckui('steam://open/keyboard')
-                case "Open Chimera":
-                    logger.debug(
-                        "Open Chimera"
-                    )
-                    self.launch_chimera()
-                case "Toggle Gyro":
-                    logger.debug(
-                        "Toggle Gyro is not currently enabled"
-                    )
-                case "Toggle Mouse Mode":
-                    logger.debug(
-                        "Toggle Mouse Mode is not currently enabled"
-                    )
-                case "Toggle Performance":
-                    logger.debug("Toggle Performance")
-                    await self.toggle_performance()
-                case "Hibernate", "Suspend", "Shutdown":
+            action = event_list[0]
+            logger.debug(action)
+            handler = self.string_handlers.get(action)
+            if handler is None:
+                if action in ("Hibernate", "Suspend", "Shutdown"):
                     logger.error(
-                        f"Power mode {event_list[0]} set to button action. "
+                        f"Power mode {action} set to button action. "
                         f"Check your configuration file."
                     )
-                case _:
-                    logger.warning(f"{event_list[0]} not defined.")
+                else:
+                    logger.warning(f"{action} not defined.")
+                return
+            result = handler()
+            if asyncio.iscoroutine(result):
+                await result
             return
 
-        logger.debug(f'Event list: {event_list}')
-        events = []
-
-        if value == 0:
-            for button_event in reversed(event_list):
-                new_event = InputEvent(
-                    seed_event.sec,
-                    seed_event.usec,
-                    button_event[0],
-                    button_event[1],
-                    value
-                )
-                events.append(new_event)
-        else:
-            for button_event in event_list:
-                new_event = InputEvent(
-                    seed_event.sec,
-                    seed_event.usec,
-                    button_event[0],
-                    button_event[1],
-                    value
-                )
-                events.append(new_event)
-
-        size = len(events)
-        if size > 1:
-            await self.emit_events(events)
-        elif size == 1:
-            self.emit_event(events[0])
+        logger.debug('Event list: %s', event_list)
+        # The kernel stamps injected events itself, so the chord is
+        # written straight to the virtual device without building
+        # InputEvent objects. One SYN_REPORT closes the frame;
+        # releases go out in reverse press order.
+        write = self.ui_device.write
+        ordered = reversed(event_list) if value == 0 else event_list
+        for button_event in ordered:
+            write(button_event[0], button_event[1], value)
+        self.ui_device.syn()
 
     def launch_chimera(self) -> bool:
         """
@@ -212,12 +346,42 @@ class EventEmitter(DeviceExplorer):
         if not self.HAS_CHIMERA_LAUNCHER:
             return False
         try:
-            subprocess.run(["su", self.USER, "-c", CHIMERA_LAUNCHER_PATH])
+            subprocess.Popen(
+                [CHIMERA_LAUNCHER_PATH],
+                user=self.UID,
+                group=self.GID,
+                extra_groups=self.user_groups(),
+                env=self.user_environment()
+            )
             return True
         except Exception as error:
             logger.exception(error)
             return False
 
+    def user_environment(self) -> dict[str, str]:
+        """
+        Environment for commands run as the logged-in user.
+        :return:
+        """
+        return {
+            **os.environ,
+            'HOME': str(self.HOME_PATH),
+            'USER': self.USER,
+            'LOGNAME': self.USER,
+        }
+
+    def user_groups(self) -> Optional[list[int]]:
+        """
+        Supplementary groups for commands run as the logged-in user.
+        Popen's user=/group= alone never calls setgroups, which would
+        leave root's groups in place and drop the user's own
+        (input/video/audio and friends).
+        :return:
+        """
+        if self.GID is None:
+            return None
+        return os.getgrouplist(self.USER, self.GID)
+
     async def toggle_performance(self):
         """
         Switch performance mode
@@ -236,19 +400,26 @@ class EventEmitter(DeviceExplorer):
         else:
             cmd_args = f'-a 12500 -b 13500 -c 12000 {mode_arg}'
 
-        await self.do_rumble()
+        self.do_rumble()
         await asyncio.sleep(FF_DELAY)
-        await self.do_rumble(interval=300)
+        self.do_rumble(interval=300)
 
         add_toast(
             title='[Handycon] Performance mode',
             body=f'Switching to "{mode_name}" mode'
         )
 
-        ryzenadj_command = f'ryzenadj {cmd_args}'
+        ryzenadj_command = ['ryzenadj', *cmd_args.split()]
         logger.debug(ryzenadj_command)
-        run = os.popen(ryzenadj_command, buffering=1).read().strip()
-        logger.debug(run)
+        # Run without blocking the event loop; os.popen().read()
+        # stalled input handling for the whole ryzenadj run.
+        proc = await asyncio.create_subprocess_exec(
+            *ryzenadj_command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        stdout, _ = await proc.communicate()
+        logger.debug(stdout.decode().strip())
 
         # command = f'echo {thermal_mode} > ' \
         #           f'/sys/devices/' \
@@ -257,7 +428,7 @@ class EventEmitter(DeviceExplorer):
         # logger.debug(
         #     f'Thermal mode set to {thermal_mode}.')
 
-    async def do_rumble(
+    def do_rumble(
             self,
             button: int = 0,
             interval: int = 10,
@@ -265,7 +436,8 @@ class EventEmitter(DeviceExplorer):
             delay: int = 0
     ):
         """
-        Process gamepad rumble
+        Queue gamepad rumble for the writer task. Plain method: it
+        only enqueues, so callers need not pay a coroutine per press.
         :param button:
         :param interval:
         :param length:
@@ -275,37 +447,95 @@ class EventEmitter(DeviceExplorer):
         # Prevent look crash if controller_device was taken.
         if not self.controller_device:
             return
+        self.rumble_queue.put_nowait((button, interval, length, delay))
 
-        # Create the rumble effect.
-        rumble = ff.Rumble(strong_magnitude=0x0000, weak_magnitude=0xffff)
-        effect = ff.Effect(
-            e.FF_RUMBLE,
-            -1,
-            0,
-            ff.Trigger(button, interval),
-            ff.Replay(length, delay),
-            ff.EffectType(ff_rumble_effect=rumble)
-        )
+    async def rumble_writer(self):
+        """
+        Queue-driven rumble I/O. Bursts are coalesced down to the
+        newest request before touching the device.
+        :return:
+        """
+        while True:
+            request = await self.rumble_queue.get()
+            while not self.rumble_queue.empty():
+                request = self.rumble_queue.get_nowait()
+            try:
+                await self.send_rumble(*request)
+            except Exception as err:
+                logger.error(f"{err} | Error sending rumble effect.")
+                logger.exception(err)
 
-        # Upload and transmit the effect.
-        effect_id = self.controller_device.upload_effect(effect)
-        self.controller_device.write(e.EV_FF, effect_id, 1)
+    async def send_rumble(
+            self,
+            button: int = 0,
+            interval: int = 10,
+            length: int = 1000,
+            delay: int = 0
+    ):
+        """
+        Process gamepad rumble
+        :param button:
+        :param interval:
+        :param length:
+        :param delay:
+        :return:
+        """
+        # Prevent look crash if controller_device was taken.
+        device = self.controller_device
+        if not device:
+            return
+
+        if device is not self.rumble_device:
+            # Re-grabbed controller: stale ids are meaningless.
+            self.rumble_effects.clear()
+            self.rumble_device = device
+
+        # The handful of patterns used are uploaded once and
+        # re-triggered, instead of an upload + erase ioctl pair
+        # per rumble.
+        pattern = (button, interval, length, delay)
+        effect_id = self.rumble_effects.get(pattern)
+        if effect_id is None:
+            rumble = ff.Rumble(
+                strong_magnitude=0x0000,
+                weak_magnitude=0xffff
+            )
+            effect = ff.Effect(
+                e.FF_RUMBLE,
+                -1,
+                0,
+                ff.Trigger(button, interval),
+                ff.Replay(length, delay),
+                ff.EffectType(ff_rumble_effect=rumble)
+            )
+            effect_id = device.upload_effect(effect)
+            self.rumble_effects[pattern] = effect_id
+
+        device.write(e.EV_FF, effect_id, 1)
         await asyncio.sleep(interval / 1000)
-        self.controller_device.erase_effect(effect_id)
+        device.write(e.EV_FF, effect_id, 0)
 
-    def steam_ifrunning_deckui(self, cmd: str) -> bool:
+    def steam_is_deckui(self) -> bool:
         """
-        Get the currently running Steam PID.
-        :param cmd:
+        Check whether Steam is running in DeckUI mode.
+        The pid file and /proc cmdline are only re-read when the pid
+        file changed since the last call.
         :return:
         """
-        add_toast(
-            title='[Handycon] Keyboard',
-            body='Openning screen keyboard'
-        )
-        steampid_path = self.HOME_PATH / '.steam/steam.pid'
         try:
-            pid = steampid_path.read_text().strip()
+            mtime = self.steam_pid_path.stat().st_mtime_ns
+        except OSError as err:
+            logger.error(f"{err} | Error getting steam PID.")
+            return False
+
+        if mtime == self._steam_pidfile_mtime:
+            return self._steam_is_deckui
+
+        self._steam_pidfile_mtime = mtime
+        self._steam_is_deckui = False
+
+        try:
+            pid = self.steam_pid_path.read_text().strip()
         except Exception as err:
             logger.error(f"{err} | Error getting steam PID.")
             logger.exception(err)
@@ -313,31 +543,41 @@ class EventEmitter(DeviceExplorer):
 
         # Get the andline for the Steam process by checking /proc.
         steam_cmd_path = Path(f"/proc/{pid}/cmdline")
-        if not steam_cmd_path.exists():
-            # Steam not running.
-            return False
-
         try:
             steam_cmd = steam_cmd_path.read_bytes()
-        except Exception as err:
-            logger.error(f"{err} | Error getting steam cmdline.")
-            logger.exception(err)
+        except OSError:
+            # Steam not running.
             return False
 
-            # Use this andline to determine if Steam is running in DeckUI mode.
+        # Use this andline to determine if Steam is running in DeckUI mode.
         # e.g. "steam://shortpowerpress" only works in DeckUI.
-        is_deckui = b"-gamepadui" in steam_cmd
-        if not is_deckui:
+        self._steam_is_deckui = b"-gamepadui" in steam_cmd
+        return self._steam_is_deckui
+
+    def steam_ifrunning_deckui(self, cmd: str) -> bool:
+        """
+        Send a command to Steam if it is running in DeckUI mode.
+        :param cmd:
+        :return:
+        """
+        add_toast(
+            title='[Handycon] Keyboard',
+            body='Openning screen keyboard'
+        )
+        if not self.steam_is_deckui():
             return False
 
-        steam_path = self.HOME_PATH / '.steam/root/ubuntu12_32/steam'
-        # steam_path = 'steam'
         try:
-            cmd = ' '.join([
-                "su", self.USER, "-c", f"'{steam_path} -ifrunning {cmd}'"
-            ])
-            logger.debug(cmd)
-            os.system(cmd)
+            argv = [str(self.steam_binary_path), '-ifrunning', cmd]
+            logger.debug(argv)
+            # One fork+exec as the user, no su/shell layers.
+            subprocess.Popen(
+                argv,
+                user=self.UID,
+                group=self.GID,
+                extra_groups=self.user_groups(),
+                env=self.user_environment()
+            )
             return True
         except Exception as err:
             logger.error(f"{err} | Error sending and to Steam.")
@@ -350,248 +590,91 @@ class EventEmitter(DeviceExplorer):
             active_keys: list[int]
     ):
         """
-        Translate event to button press
-        :param handycon:
+        Translate event to button press.
+        active_keys must be sorted ascending, the chord tables
+        are keyed on canonical order.
         :param seed_event:
         :param active_keys:
         :return:
         """
-        logger.debug(f'seed_event: {seed_event}')
-        logger.debug(f'active_keys: {active_keys}')
-        # Button map shortcuts for easy reference.
-        button1 = self.button_map["button1"]  # Default Screenshot
-        button2 = self.button_map["button2"]  # Default QAM
-        button3 = self.button_map["button3"]  # Default ESC
-        button4 = self.button_map["button4"]  # Default OSK
-        button5 = self.button_map["button5"]  # Default MODE
-        button6 = self.button_map["button6"]
-        # button7 = self.button_map["button7"]
-        button8 = self.button_map["button8"]
-        button9 = self.button_map["button9"]
-        button10 = self.button_map["button10"]
-        button11 = self.button_map["button11"]
-        button12 = self.button_map["button12"]
-
-        button_a = EVENT_BTN_A
-        # button_b = EVENT_BTN_B
-        button_x = EVENT_BTN_X
-        # button_y = EVENT_BTN_Y
+        logger.debug('seed_event: %s', seed_event)
+        logger.debug('active_keys: %s', active_keys)
 
         # Loop variables
-        button_on = seed_event.value
-        this_button = None
-
-        # Handle missed keys.
-        if active_keys == [] and self.event_queue != []:
-            this_button = self.event_queue[0]
-
-        if active_keys == [186, 311] \
-                and seed_event.code == 186 \
-                and button_on == 1:
-            this_button = ["Increase screen brightness"]
-
-        if active_keys == [186, 310] \
-                and seed_event.code == 186 \
-                and button_on == 1:
-            this_button = ["Decrease screen brightness"]
-
-        if active_keys == [148, 311] \
-                and seed_event.code == 148 \
-                and button_on == 1:
-            this_button = ["Increase led brightness"]
-
-        if active_keys == [148, 310] \
-                and seed_event.code == 148 \
-                and button_on == 1:
-            this_button = ["Decrease led brightness"]
-
-        if active_keys == [148, 310, 311] \
-                and seed_event.code == 148 \
-                and button_on == 1:
-            this_button = ["Switch led mode"]
-
-        if active_keys == [186, 310, 311] \
-                and seed_event.code == 186 \
-                and button_on == 1:
-            this_button = ["Toggle Performance"]
-
-        if active_keys == [186, 307] \
-                and seed_event.code == 186 \
-                and button_on == 1:
-            this_button = ["Open Keyboard"]
-
-        if active_keys == [187] \
-                and button_on in [1, 2]:
-            await self.emit_now(seed_event, button_a, 1)
-        elif active_keys == [] \
-                and seed_event.code == 187 \
-                and button_on == 0:
-            await self.emit_now(seed_event, button_a, 0)
-
-        if active_keys == [188] \
-                and button_on in [1, 2]:
-            await self.emit_now(seed_event, button_x, 1)
-        elif active_keys == [] \
-                and seed_event.code == 188 \
-                and button_on == 0:
-            await self.emit_now(seed_event, button_x, 0)
-
-        # BUTTON 1 (Default: Screenshot) Paddle + Y
-        if active_keys == [184] \
-                and button_on == 1 \
-                and button1 not in self.event_queue:
-            self.event_queue.append(button1)
-        elif active_keys == [] \
-                and seed_event.code in [184, 185] \
-                and button_on == 0 \
-                and button1 in self.event_queue:
-            this_button = button1
-
-        # BUTTON 2 (Default: QAM) Armory Crate Button Short Press
-        if active_keys == [148] \
-                and button_on == 1 \
-                and button2 not in self.event_queue:
-            self.event_queue.append(button2)
-        elif active_keys == [] \
-                and seed_event.code in [148] \
-                and button_on == 0 \
-                and button2 in self.event_queue:
-            this_button = button2
-
-        # BUTTON 3 (Default: ESC) Paddle + X Temp disabled, goes nuts.
-        # This event triggers from KEYBOARD_2.
-        if active_keys == [25, 125] \
-                and button_on == 1 \
-                and button3 not in self.event_queue:
-            self.event_queue.append(button3)
-        elif active_keys == [] \
-                and seed_event.code in [49, 125, 185] \
-                and button_on == 0 \
-                and button3 in self.event_queue:
-            this_button = button3
-
-        # BUTTON 4 (Default: OSK) Paddle + D-Pad UP
-        if active_keys == [88] \
-                and button_on == 1 \
-                and button4 not in self.event_queue:
-            self.event_queue.append(button4)
-        elif active_keys == [] \
-                and seed_event.code in [88, 185] \
-                and button_on == 0 \
-                and button4 in self.event_queue:
-            this_button = button4
-
-        # BUTTON 5 (Default: Mode) Control Center Short Press.
-        if active_keys == [186] \
-                and button_on == 1 \
-                and button5 not in self.event_queue:
-            self.event_queue.append(button5)
-        elif active_keys == [] \
-                and seed_event.code in [186] \
-                and button_on == 0 \
-                and button5 in self.event_queue:
-            this_button = button5
-
-        # BUTTON 6 (Default: Launch Chimera) Paddle + A
-        if active_keys == [68] \
-                and button_on == 1 \
-                and button6 not in self.event_queue:
-            self.event_queue.append(button6)
-        elif active_keys == [] \
-                and seed_event.code in [68, 185] \
-                and button_on == 0 \
-                and button6 in self.event_queue:
-            this_button = button6
-
-        # BUTTON 7 (Default: Toggle Performance) Armory Crate Button Long Press
-        # This button triggers immediate down/up
-        # after holding for ~1s an F17 and then
-        # released another down/up for F18 on release.
-        # We use the F18 "KEY_UP" for release.
-        # if active_keys == [187] \
-        #         and button_on == 1 \
-        #         and button7 not in self.event_queue:
-        #     self.event_queue.append(button7)
-        #     await self.do_rumble(0, 150, 1000, 0)
-        # elif active_keys == [] \
-        #         and seed_event.code in [188] \
-        #         and button_on == 0 \
-        #         and button7 in self.event_queue:
-        #     this_button = button7
-
-        # BUTTON 8 (Default: Mode) Control Center Long Press.
-        # This event triggers from KEYBOARD_2.
-        if active_keys == [29, 56, 111] \
-                and button_on == 1 \
-                and button8 not in self.event_queue:
-            self.event_queue.append(button8)
-            await self.do_rumble(0, 150, 1000, 0)
-        elif active_keys == [] \
-                and seed_event.code in [29, 56, 111] \
-                and button_on == 0 \
-                and button8 in self.event_queue:
-            this_button = button8
-
-        # BUTTON 9 (Default: Toggle Mouse) Paddle + D-Pad DOWN
-        # This event triggers from KEYBOARD_2.
-        if active_keys == [1, 29, 42] \
-                and button_on == 1 \
-                and button9 not in self.event_queue:
-            self.event_queue.append(button9)
-        elif active_keys == [] \
-                and seed_event.code in [1, 29, 42, 185] \
-                and button_on == 0 \
-                and button9 in self.event_queue:
-            this_button = button9
-
-        # BUTTON 10 (Default: ALT+TAB) Paddle + D-Pad LEFT
-        # This event triggers from KEYBOARD_2.
-        if active_keys == [32, 125] \
-                and button_on == 1 \
-                and button10 not in self.event_queue:
-            self.event_queue.append(button10)
-        elif active_keys == [] \
-                and seed_event.code in [32, 125, 185] \
-                and button_on == 0 \
-                and button10 in self.event_queue:
-            this_button = button10
-
-        # BUTTON 11 (Default: KILL) Paddle + D-Pad RIGHT
-        # This event triggers from KEYBOARD_2.
-        if active_keys == [15, 125] \
-                and button_on == 1 \
-                and button11 not in self.event_queue:
-            self.event_queue.append(button11)
-        elif active_keys == [] \
-                and seed_event.code in [15, 125, 185] \
-                and button_on == 0 \
-                and button11 in self.event_queue:
-            this_button = button11
-
-        # BUTTON 12 (Default: Toggle Gyro) Paddle + B
-        # This event triggers from KEYBOARD_2.
-        if active_keys == [49, 125] \
-                and button_on == 1 \
-                and button12 not in self.event_queue:
-            self.event_queue.append(button12)
-        elif active_keys == [] \
-                and seed_event.code in [25, 125, 185] \
-                and button_on == 0 \
-                and button12 in self.event_queue:
-            this_button = button12
+        button_on: int = seed_event.value
+        this_button: Optional[tuple] = None
+
+        if active_keys:
+            chord = tuple(active_keys)
+            direct = DIRECT_PRESS_CHORDS.get(chord)
+            if direct is not None:
+                if button_on in (1, 2):
+                    await self.emit_now(seed_event, direct, 1)
+            elif button_on == 1:
+                string_chord = STRING_CHORDS.get(chord)
+                if string_chord is not None:
+                    # String actions are one-shot commands with no
+                    # release to pair, so they stay out of the
+                    # last_button machinery: parking one there wedged
+                    # every queued chord behind missed-key recovery.
+                    # Fires only on its closing key, not on the
+                    # modifiers.
+                    if seed_event.code == string_chord[0]:
+                        await self.emit_now(
+                            seed_event,
+                            string_chord[1],
+                            1
+                        )
+                    return
+                else:
+                    press = self.press_chords.get(chord)
+                    if press is not None:
+                        button, rumble = press
+                        # Drop bounced re-presses of the same chord.
+                        now = time.monotonic()
+                        if now - self.press_times.get(chord, 0.0) \
+                                < self.BUTTON_DELAY:
+                            return
+                        self.press_times[chord] = now
+                        if button not in self.event_queue:
+                            self.event_queue[button] = None
+                            if rumble:
+                                self.do_rumble(0, 150, 1000, 0)
+        else:
+            # All keys are up: releases and missed-key recovery.
+            direct = DIRECT_RELEASE_CODES.get(seed_event.code) \
+                if button_on == 0 else None
+            if direct is not None:
+                await self.emit_now(seed_event, direct, 0)
+            else:
+                if button_on == 0:
+                    for button in self.release_codes.get(
+                            seed_event.code, ()):
+                        if button in self.event_queue:
+                            this_button = button
+                            break
+                # Handle missed keys.
+                if this_button is None and self.event_queue:
+                    this_button = next(iter(self.event_queue))
 
         # Create list of events to fire.
         # Handle new button presses.
-        if this_button and not self.last_button:
-            try:
-                self.event_queue.remove(this_button)
-            except ValueError:
-                pass
+        if this_button:
+            if self.last_button:
+                # A new chord can resolve while the previous press is
+                # still open (missed-key recovery): close the old one
+                # first, or both stay set and neither branch can ever
+                # run again.
+                await self.emit_now(seed_event, self.last_button, 0)
+                self.last_button = None
+            self.event_queue.pop(this_button, None)
             self.last_button = this_button
             await self.emit_now(seed_event, this_button, 1)
 
-        # Clean up old button presses.
-        elif self.last_button and not this_button:
+        # Clean up old button presses, but only once the chord is
+        # actually released. Without the active_keys gate a repeat
+        # event mid-press emitted a spurious release.
+        elif self.last_button and not active_keys:
             await self.emit_now(seed_event, self.last_button, 0)
             self.last_button = None
 
@@ -600,8 +683,10 @@ class EventEmitter(DeviceExplorer):
         Performs specific power actions based on user config.
         :return:
         """
-        logger.debug(f"Power Action: Hibernate")
-        os.system('systemctl hibernate')
+        logger.debug("Power Action: %s", self.power_action)
+        if self.power_argv:
+            # Precomputed argv, no /bin/sh fork.
+            subprocess.Popen(self.power_argv)
 
     async def handle_key_down(
             self,
@@ -614,7 +699,7 @@ class EventEmitter(DeviceExplorer):
         :param queued_event:
         :return:
         """
-        self.event_queue.append(queued_event)
+        self.event_queue[queued_event] = None
         if queued_event in INSTANT_EVENTS:
             await self.emit_now(seed_event, queued_event, 1)
 
@@ -630,13 +715,13 @@ class EventEmitter(DeviceExplorer):
         :return:
         """
         if queued_event in INSTANT_EVENTS:
-            self.event_queue.remove(queued_event)
+            self.event_queue.pop(queued_event, None)
             await self.emit_now(seed_event, queued_event, 0)
         elif queued_event in QUEUED_EVENTS:
             # Create list of events to fire.
             # Handle new button presses.
             if not self.last_button:
-                self.event_queue.remove(queued_event)
+                self.event_queue.pop(queued_event, None)
                 self.last_button = queued_event
                 await self.emit_now(seed_event, queued_event, 1)
                 return
@@ -13,15 +13,24 @@ import sys
 import warnings
 
 # Local modules
-from .notify_db import add_toast
+from .notify_db import add_toast, flush_toasts
 from .event_emitter import EventEmitter
 from .constants import \
     HIDE_PATH, \
-    DETECT_DELAY
+    DETECT_DELAY, \
+    PASSTHROUGH_CODES
 
 # Partial imports
 from evdev import ecodes as e
 
+# libuv-backed event loop, worth 2-4x on selector-heavy
+# workloads like ours. Optional.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 
 logger = logging.getLogger('handycon')
 
@@ -40,19 +49,42 @@ class HandheldController(EventEmitter):
         EventEmitter.__init__(self)
 
         # Run asyncio loop to capture all events.
-        self.loop = asyncio.get_event_loop()
+        # get_event_loop is deprecated outside a running loop.
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        # Wakes the capture loops when udev reports a new
+        # input device.
+        self.device_arrived = asyncio.Event()
+        # Bounded so a stalled controller applies backpressure to the
+        # FF reader instead of growing an unbounded backlog.
+        self.ff_queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        if self.udev_monitor is not None:
+            self.loop.add_reader(
+                self.udev_monitor.fileno(),
+                self.on_udev_event
+            )
 
         # Attach the event loop of each device to the asyncio loop.
-        asyncio.ensure_future(self.capture_controller_events())
-        asyncio.ensure_future(self.capture_ff_events())
-        asyncio.ensure_future(self.capture_keyboard_events())
+        # Tasks are tracked so exit() can cancel exactly these.
+        self.tasks = [
+            asyncio.ensure_future(self.capture_controller_events()),
+            asyncio.ensure_future(self.capture_ff_events()),
+            asyncio.ensure_future(self.capture_keyboard_events()),
+        ]
         if self.KEYBOARD_2_NAME != '' and self.KEYBOARD_2_ADDRESS != '':
-            asyncio.ensure_future(self.capture_keyboard_2_events())
+            self.tasks.append(
+                asyncio.ensure_future(self.capture_keyboard_2_events())
+            )
 
-        asyncio.ensure_future(self.capture_power_events())
+        self.tasks.append(asyncio.ensure_future(self.capture_power_events()))
+        self.tasks.append(asyncio.ensure_future(self.ff_writer()))
+        self.tasks.append(asyncio.ensure_future(self.rumble_writer()))
         logger.info("Handheld Game Console Controller Service started.")
 
         # Establish signaling to handle gracefull shutdown.
+        # One shared handler, none of the signals are treated
+        # differently.
         for recv_signal in (
                 signal.SIGHUP,
                 signal.SIGTERM,
@@ -61,7 +93,7 @@ class HandheldController(EventEmitter):
         ):
             self.loop.add_signal_handler(
                 recv_signal,
-                lambda s=recv_signal: asyncio.create_task(self.exit())
+                self.request_shutdown
             )
 
         exit_code = 0
@@ -78,58 +110,64 @@ class HandheldController(EventEmitter):
             self.loop.stop()
             sys.exit(exit_code)
 
+    def request_shutdown(self):
+        """
+        Signal handler, schedules the graceful shutdown. Guarded so
+        a repeated signal cannot schedule exit() twice.
+        :return:
+        """
+        if self.shutdown:
+            return
+        self.shutdown = True
+        asyncio.create_task(self.exit())
+
+    def on_udev_event(self):
+        """
+        Drain pending udev events and wake the capture loops
+        if an input device appeared.
+        :return:
+        """
+        arrived = False
+        while True:
+            device = self.udev_monitor.poll(timeout=0)
+            if device is None:
+                break
+            if device.action == 'add':
+                arrived = True
+        if arrived:
+            self.device_arrived.set()
+
+    async def wait_for_device(self):
+        """
+        Sleep until udev reports a new input device. Falls back to a
+        plain DETECT_DELAY sleep when no monitor is available, and
+        still times out so a missed event cannot stall detection.
+        :return:
+        """
+        if self.udev_monitor is None:
+            await asyncio.sleep(DETECT_DELAY)
+            return
+        try:
+            await asyncio.wait_for(
+                self.device_arrived.wait(),
+                timeout=10 * DETECT_DELAY
+            )
+        except asyncio.TimeoutError:
+            pass
+        self.device_arrived.clear()
+
     async def capture_keyboard_events(self):
         """
         Capture keyboard events and translate them to mapped events.
         :return:
         """
-        while self.running:
-            if self.keyboard_device:
-                try:
-                    async for seed_event \
-                            in self.keyboard_device.async_read_loop():
-                        # Loop variables
-                        active_keys: list[int] = self.keyboard_device.active_keys()
-                        if self.keyboard_2_device:
-                            active_keys.extend(self.keyboard_2_device.active_keys())
-                        if self.controller_device:
-                            active_keys.extend(self.controller_device.active_keys())
-
-                        # Debugging variables
-                        logger.debug(
-                            f"Seed Value: {seed_event.value}, "
-                            f"Seed Code: {seed_event.code}, "
-                            f"Seed Type: {seed_event.type}."
-                        )
-                        logger.debug(f"Active Keys: {active_keys}")
-                        logger.debug(f"Queued events: {self.event_queue}")
-
-                        # Capture keyboard events
-                        # and translate them to mapped events.
-                        await self.process_event(seed_event, active_keys)
-
-                except Exception as err:
-                    error_text = f"{err} | " \
-                                 f"Error reading events from " \
-                                 f"{self.keyboard_device.name}"
-                    logger.error(error_text)
-                    logger.exception(err)
-                    add_toast(
-                        title='[Handycon][error] capture_keyboard_events',
-                        body=error_text
-                    )
-                    self.remove_device(HIDE_PATH, self.keyboard_event)
-                    self.keyboard_device = None
-                    self.keyboard_event = None
-                    self.keyboard_path = None
-            else:
-                logger.info("Attempting to grab keyboard device...")
-                add_toast(
-                    title='[Handycon] capture_keyboard_events',
-                    body='Attempting to grab keyboard device...'
-                )
-                self.get_keyboard()
-                await asyncio.sleep(DETECT_DELAY)
+        await self.capture_keyboard_device(
+            'keyboard_device',
+            'keyboard_event',
+            'keyboard_path',
+            self.get_keyboard,
+            'keyboard device'
+        )
 
     # Captures keyboard events and translates them to virtual device events.
     async def capture_keyboard_2_events(self):
@@ -137,102 +175,189 @@ class HandheldController(EventEmitter):
         Capture keyboard events and translate them to mapped events.
         :return:
         """
+        await self.capture_keyboard_device(
+            'keyboard_2_device',
+            'keyboard_2_event',
+            'keyboard_2_path',
+            self.get_keyboard_2,
+            'keyboard device 2'
+        )
+
+    async def capture_keyboard_device(
+            self,
+            device_attr: str,
+            event_attr: str,
+            path_attr: str,
+            getter,
+            label: str
+    ):
+        """
+        Shared capture loop for both keyboards: the two devices only
+        differ in which attributes hold them and which getter
+        re-grabs them.
+        :param device_attr:
+        :param event_attr:
+        :param path_attr:
+        :param getter:
+        :param label:
+        :return:
+        """
         while self.running:
-            if self.keyboard_2_device:
+            device = getattr(self, device_attr)
+            if device:
                 try:
-                    async for seed_event \
-                            in self.keyboard_2_device.async_read_loop():
-                        # Loop variables
-                        active_keys: list[int] = self.keyboard_2_device.active_keys()
-                        if self.keyboard_device:
-                            active_keys.extend(self.keyboard_device.active_keys())
-                        if self.controller_device:
-                            active_keys.extend(self.controller_device.active_keys())
-
-                        # Debugging variables
-                        logger.debug(
-                            f"Seed Value: {seed_event.value}, "
-                            f"Seed Code: {seed_event.code}, "
-                            f"Seed Type: {seed_event.type}."
-                        )
-                        logger.debug(f"Active Keys: {active_keys}")
-                        logger.debug(f"Queued events: {self.event_queue}")
-                        logger.debug('-----' * 10)
-
-                        # Capture keyboard events
-                        # and translate them to mapped events.
-                        await self.process_event(
-                            seed_event,
-                            active_keys
-                        )
-
-                except Exception as err:
+                    # Hoisted out of the loop: f-strings are built
+                    # eagerly even when DEBUG is off.
+                    debug_on = logger.isEnabledFor(logging.DEBUG)
+                    self.sync_held_keys()
+                    active_keys: list[int] = []
+                    # Bound once per grab: LOAD_FAST beats LOAD_ATTR
+                    # in the per-event loop.
+                    read = device.async_read
+                    emit = self.emit_event
+                    track = self.track_key
+                    process = self.process_event
+                    while self.running:
+                        # One await per burst instead of one per
+                        # event; async_read drains everything the
+                        # device has pending.
+                        for seed_event in await read():
+                            # Pass volume keys through as-is,
+                            # they never participate in chords.
+                            if seed_event.code in PASSTHROUGH_CODES:
+                                emit(seed_event)
+                                continue
+
+                            # Loop variables.
+                            # process_event relies on active_keys
+                            # being sorted ascending (chord literals
+                            # are written that way). The held key set
+                            # tracks EV_KEY transitions, so no ioctl
+                            # per event.
+                            if seed_event.type == e.EV_KEY:
+                                track(seed_event)
+                                active_keys = sorted(self.held_keys)
+
+                            # Debugging variables
+                            if debug_on:
+                                logger.debug(
+                                    f"Seed Value: {seed_event.value}, "
+                                    f"Seed Code: {seed_event.code}, "
+                                    f"Seed Type: {seed_event.type}."
+                                )
+                                logger.debug(f"Active Keys: {active_keys}")
+                                logger.debug(f"Queued events: {self.event_queue}")
+
+                            # Capture keyboard events
+                            # and translate them to mapped events.
+                            await process(seed_event, active_keys)
+
+                except OSError as err:
                     error_text = f"{err} | " \
                                  f"Error reading events from " \
-                                 f"{self.keyboard_device.name}"
-                    logger.error(error_text)
-                    logger.exception(err)
+                                 f"{device.name}"
+                    logger.error(error_text, exc_info=err)
                     add_toast(
-                        title='[Handycon][error] capture_keyboard_events_2',
+                        title='[Handycon][error] capture_keyboard_events',
                         body=error_text
                     )
-                    self.remove_device(HIDE_PATH, self.keyboard_2_event)
-                    self.keyboard_2_device = None
-                    self.keyboard_2_event = None
-                    self.keyboard_2_path = None
+                    self.remove_device(HIDE_PATH, getattr(self, event_attr))
+                    setattr(self, device_attr, None)
+                    setattr(self, event_attr, None)
+                    setattr(self, path_attr, None)
+                    self.sync_held_keys()
+                except Exception as err:
+                    # Not a device error: log it, keep the grab. A
+                    # re-grab cycle costs DETECT_DELAY of lost input.
+                    logger.exception(err)
             else:
-                logger.info("Attempting to grab keyboard device 2...")
+                logger.info(f"Attempting to grab {label}...")
                 add_toast(
                     title='[Handycon] capture_keyboard_events',
-                    body='Attempting to grab keyboard device 2...'
+                    body=f'Attempting to grab {label}...'
                 )
-                self.get_keyboard_2()
-                await asyncio.sleep(DETECT_DELAY)
+                getter()
+                await self.wait_for_device()
 
     async def capture_controller_events(self):
         """
         Capture keyboard events and translate them to mapped events.
         :return:
         """
-        logger.debug(f"capture_controller_events, {self.running}")
+        logger.debug("capture_controller_events, %s", self.running)
         while self.running:
             if self.controller_device:
                 try:
-                    async for event in \
-                            self.controller_device.async_read_loop():
-                        # Block FF events, or get infinite recursion.
-                        # Up to you I guess...
-                        if event.type in [e.EV_FF, e.EV_UINPUT]:
-                            continue
-                        # # Loop variables
-                        # active_keys = self.controller_device.active_keys()
-                        #
-                        # # Debugging variables
-                        # logger.debug(
-                        #     f"Seed Value: {event.value}, "
-                        #     f"Seed Code: {event.code}, "
-                        #     f"Seed Type: {event.type}."
-                        # )
-                        # logger.debug(f"Active Keys: {active_keys}")
-                        # logger.debug(f"Queued events: {self.event_queue}")
-                        # logger.debug('-----' * 10)
-
-                        # Output the event.
-                        self.emit_event(event)
-                except Exception as err:
+                    self.sync_held_keys()
+                    # Local bindings, one dict probe each instead of
+                    # attribute/global lookups per event.
+                    read = self.controller_device.async_read
+                    track = self.track_key
+                    emit = self.emit_event
+                    ev_ff = e.EV_FF
+                    ev_uinput = e.EV_UINPUT
+                    ev_key = e.EV_KEY
+                    ev_abs = e.EV_ABS
+                    ev_syn = e.EV_SYN
+                    while self.running:
+                        # Wake once per readable fd and drain all
+                        # pending events synchronously, instead of
+                        # one coroutine resume per event.
+                        events = await read()
+
+                        # Within one SYN frame only the last value of
+                        # an axis matters; drop the stale ones so a
+                        # stick flood doesn't multiply ui writes.
+                        if len(events) > 2:
+                            keep = [True] * len(events)
+                            seen_axes: set[int] = set()
+                            for index in range(len(events) - 1, -1, -1):
+                                event = events[index]
+                                if event.type == ev_syn:
+                                    seen_axes.clear()
+                                elif event.type == ev_abs:
+                                    if event.code in seen_axes:
+                                        keep[index] = False
+                                    else:
+                                        seen_axes.add(event.code)
+                            events = [
+                                event
+                                for index, event in enumerate(events)
+                                if keep[index]
+                            ]
+
+                        for event in events:
+                            # Block FF events, or get infinite recursion.
+                            # Up to you I guess...
+                            event_type = event.type
+                            if event_type == ev_ff or event_type == ev_uinput:
+                                continue
+
+                            # Keep the shared held key set current for
+                            # the keyboard chord dispatch.
+                            if event_type == ev_key:
+                                track(event)
+
+                            # Output the event.
+                            emit(event)
+                except OSError as err:
                     error_text = f"{err} | " \
                                  f"Error reading events from " \
-                                 f"{self.keyboard_device.name}"
-                    logger.error(error_text)
-                    logger.exception(err)
+                                 f"{self.controller_device.name}"
+                    logger.error(error_text, exc_info=err)
                     add_toast(
                         title='[Handycon][error] capture_controller_events',
                         body=error_text
                     )
                     self.remove_device(HIDE_PATH, self.controller_event)
+                    self.controller_ready.clear()
                     self.controller_device = None
                     self.controller_event = None
                     self.controller_path = None
+                    self.sync_held_keys()
+                except Exception as err:
+                    # Not a device error: log it, keep the grab.
+                    logger.exception(err)
             else:
                 logger.info("Attempting to grab controller device...")
                 add_toast(
@@ -240,11 +365,14 @@ class HandheldController(EventEmitter):
                     body='Attempting to grab controller...'
                 )
                 self.get_controller()
-                await asyncio.sleep(DETECT_DELAY)
+                await self.wait_for_device()
 
     async def capture_power_events(self):
         """
         Captures power events and handles long or short press events.
+        The power key fires a handful of times per session, so it is
+        serviced by a plain fd callback instead of a read coroutine:
+        the loop wakes only when the key is actually pressed.
         :return:
         """
 
@@ -257,52 +385,99 @@ class HandheldController(EventEmitter):
             else:
                 logger.warning(
                     'Power device is undefined, searching for it...')
-                logger.warning(
-                    "Attempting to grab controller device...")
                 self.get_powerkey()
-                await asyncio.sleep(DETECT_DELAY)
+                await self.wait_for_device()
                 continue
 
+            power_failed = asyncio.Event()
+            self.loop.add_reader(
+                power_key.fd,
+                self.on_power_event,
+                power_key,
+                power_failed
+            )
             try:
-                async for event in power_key.async_read_loop():
-                    logger.debug(
-                        f"Got event: "
-                        f"{event.type} | {event.code} | {event.value}"
-                    )
-                    if event.type == e.EV_KEY and event.code == 116:
-                        # KEY_POWER
-                        if event.value == 0:
-                            self.handle_power_action()
-
-            except Exception as err:
-                error_text = f"{err} | Error reading events from power device."
-                logger.error(error_text)
-                logger.exception(err)
-                add_toast(
-                    title='[Handycon] capture_power_events',
-                    body='Attempting to grab controller...'
+                await power_failed.wait()
+            finally:
+                self.loop.remove_reader(power_key.fd)
+
+            error_text = "Error reading events from power device."
+            logger.error(error_text)
+            add_toast(
+                title='[Handycon] capture_power_events',
+                body='Attempting to grab power device...'
+            )
+            self.power_device = None
+            self.power_device_2 = None
+
+    def on_power_event(self, power_key, power_failed: asyncio.Event):
+        """
+        Drain the power device and react to power key releases.
+        :param power_key:
+        :param power_failed: set when the device needs a re-grab
+        :return:
+        """
+        try:
+            for event in power_key.read():
+                # Filter first: power devices emit plenty of EV_SYN
+                # noise that needs nothing, not even a debug line.
+                if event.type != e.EV_KEY or event.code != e.KEY_POWER:
+                    continue
+                logger.debug(
+                    "Got event: %s | %s | %s",
+                    event.type, event.code, event.value
                 )
-                self.power_device = None
-                self.power_device_2 = None
+                if event.value == 0:
+                    self.handle_power_action()
+        except BlockingIOError:
+            pass
+        except OSError as err:
+            logger.error("%s | Power device lost.", err)
+            power_failed.set()
 
     async def capture_ff_events(self):
         """
-        Handle FF event uploads
+        Read FF events from the virtual device and queue them, so a
+        slow upload/erase ioctl against the controller never blocks
+        reading the next FF event.
         :return:
         """
 
-        ff_effect_id_set = set()
-
+        put = self.ff_queue.put
         async for event in self.ui_device.async_read_loop():
-            if self.controller_device is None:
-                # Slow down the loop, so we don't waste millions of cycles
-                # and overheat our controller.
-                await asyncio.sleep(DETECT_DELAY)
-                continue
+            await put(event)
+
+    async def ff_writer(self):
+        """
+        Consume queued FF events and mirror them onto the controller.
+        :return:
+        """
+
+        # Kernel effect ids are small non-negative ints, so a flat
+        # byte table is enough to know which ids we have uploaded.
+        ff_effect_ids = bytearray(128)
+
+        # Code -> handler, resolved once instead of an if/elif
+        # per EV_UINPUT event.
+        ff_dispatch = {
+            e.UI_FF_UPLOAD: self.handle_ff_upload,
+            e.UI_FF_ERASE: self.handle_ff_erase,
+        }
+
+        while True:
+            event = await self.ff_queue.get()
+            device = self.controller_device
+            if device is None:
+                # Park until a controller is grabbed instead of
+                # waking up for every virtual device event.
+                await self.controller_ready.wait()
+                device = self.controller_device
+                if device is None:
+                    continue
 
             if event.type == e.EV_FF:
                 # Forward FF event to controller.
-                self.controller_device.write(
+                device.write(
                     e.EV_FF,
                     event.code,
                     event.value
@@ -317,51 +492,70 @@ class HandheldController(EventEmitter):
             if event.type != e.EV_UINPUT:
                 continue
 
-            if event.code == e.UI_FF_UPLOAD:
-                # Upload to the virtual device to prevent threadlocking.
-                # This does nothing else
-                upload = self.ui_device.begin_upload(event.value)
-                effect = upload.effect
+            handler = ff_dispatch.get(event.code)
+            if handler is not None:
+                handler(event, ff_effect_ids)
 
-                if effect.id not in ff_effect_id_set:
-                    effect.id = -1  # set to -1
-                    # for kernel to allocate a new id.
-                    # all other values throw an error for invalid input.
+    def handle_ff_upload(self, event, ff_effect_ids: bytearray):
+        """
+        Mirror an FF effect upload onto the physical controller.
+        :param event:
+        :param ff_effect_ids:
+        :return:
+        """
+        # Upload to the virtual device to prevent threadlocking.
+        # This does nothing else
+        upload = self.ui_device.begin_upload(event.value)
+        effect = upload.effect
 
-                try:
-                    # Upload to the actual controller.
-                    effect_id = self.controller_device.upload_effect(
-                        effect
-                    )
-                    effect.id = effect_id
+        if not (0 <= effect.id < len(ff_effect_ids)
+                and ff_effect_ids[effect.id]):
+            effect.id = -1  # set to -1
+            # for kernel to allocate a new id.
+            # all other values throw an error for invalid input.
 
-                    ff_effect_id_set.add(effect_id)
+        try:
+            # Upload to the actual controller.
+            effect_id = self.controller_device.upload_effect(
+                effect
+            )
+            effect.id = effect_id
 
-                    upload.retval = 0
-                except IOError as err:
-                    logger.error(
-                        f"{err} | Error uploading effect {effect.id}."
-                    )
-                    logger.exception(err)
-                    upload.retval = -1
+            if effect_id < len(ff_effect_ids):
+                ff_effect_ids[effect_id] = 1
 
-                self.ui_device.end_upload(upload)
+            upload.retval = 0
+        except IOError as err:
+            logger.error(
+                f"{err} | Error uploading effect {effect.id}."
+            )
+            logger.exception(err)
+            upload.retval = -1
 
-            elif event.code == e.UI_FF_ERASE:
-                erase = self.ui_device.begin_erase(event.value)
+        self.ui_device.end_upload(upload)
 
-                try:
-                    self.controller_device.erase_effect(erase.effect_id)
-                    ff_effect_id_set.remove(erase.effect_id)
-                    erase.retval = 0
-                except IOError as err:
-                    logger.error(
-                        f"{err} | Error erasing effect {erase.effect_id}."
-                    )
-                    logger.exception(err)
-                    erase.retval = -1
+    def handle_ff_erase(self, event, ff_effect_ids: bytearray):
+        """
+        Mirror an FF effect erase onto the physical controller.
+        :param event:
+        :param ff_effect_ids:
+        :return:
+        """
+        erase = self.ui_device.begin_erase(event.value)
+
+        try:
+            self.controller_device.erase_effect(erase.effect_id)
+            if 0 <= erase.effect_id < len(ff_effect_ids):
+                ff_effect_ids[erase.effect_id] = 0
+            erase.retval = 0
+        except IOError as err:
+            logger.error(
+                f"{err} | Error erasing effect {erase.effect_id}."
+            )
+            logger.exception(err)
+            erase.retval = -1
 
-                self.ui_device.end_erase(erase)
+        self.ui_device.end_erase(erase)
 
     async def exit(self):
         """
@@ -371,49 +565,42 @@ class HandheldController(EventEmitter):
         logger.info("Receved exit signal. Restoring devices.")
         self.running = False
 
-        for device, event, path in filter(
-            lambda x: x[0] is not None,
-            [
-                (self.controller_device,
-                 self.controller_event,
-                 self.controller_path),
-                (self.keyboard_device,
-                 self.keyboard_event,
-                 self.keyboard_path),
-                (self.keyboard_2_device,
-                 self.keyboard_2_event,
-                 self.keyboard_2_path),
-            ]
-        ):
+        # Power devices are grabbed but never hidden, so they are
+        # ungrabbed without a restore.
+        for device, event, path in [
+            (self.controller_device,
+             self.controller_event,
+             self.controller_path),
+            (self.keyboard_device,
+             self.keyboard_event,
+             self.keyboard_path),
+            (self.keyboard_2_device,
+             self.keyboard_2_event,
+             self.keyboard_2_path),
+            (self.power_device if self.CAPTURE_POWER else None,
+             None,
+             None),
+            (self.power_device_2 if self.CAPTURE_POWER else None,
+             None,
+             None),
+        ]:
+            if device is None:
+                continue
             try:
                 device.ungrab()
             except IOError:
                 pass
-            self.restore_device(event, path)
-
-        if self.power_device and self.CAPTURE_POWER:
-            try:
-                self.power_device.ungrab()
-            except IOError:
-                pass
-        if self.power_device_2 and self.CAPTURE_POWER:
-            try:
-                self.power_device_2.ungrab()
-            except IOError:
-                pass
+            if event is not None:
+                self.restore_device(event, path)
         logger.info("Devices restored.")
 
         # Kill all tasks. They are infinite loops so we will wait forver.
-        for task in [
-            t
-            for t in asyncio.all_tasks()
-            if t is not asyncio.current_task()
-        ]:
+        for task in self.tasks:
             task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError as err:
-                logger.exception(err)
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        # Toasts still sitting in the debounce window would be lost
+        # with the loop.
+        flush_toasts()
         self.loop.stop()
         logger.info("Handheld Game Console Controller Service stopped.")
 
@@ -1,4 +1,6 @@
+import asyncio
 import pathlib
+from collections import deque
 
 import peewee
 
@@ -8,6 +10,7 @@ db_path.mkdir(exist_ok=True, parents=True)
 
 db = peewee.SqliteDatabase(db_path / 'data.db', pragmas={
     'journal_mode': 'wal',
+    'synchronous': 'normal',
     'cache_size': -1024 * 64})
 
 
@@ -26,16 +29,67 @@ class Toast(BaseModel):
     to_notify = peewee.BooleanField(default=True)
 
 
+# Toast bursts (device connect/disconnect storms) are buffered and
+# flushed as one insert_many transaction, so the event loop pays one
+# SQL parse and commit per burst instead of one per toast.
+_pending: deque = deque()
+_flush_handle = None
+_FLUSH_DELAY = 0.5
+
+
+_schema_ready = False
+
+
+def _ensure_schema():
+    global _schema_ready
+    if not _schema_ready:
+        Toast.create_table(safe=True)
+        _schema_ready = True
+
+
+def _flush_pending():
+    global _flush_handle
+    _flush_handle = None
+    if not _pending:
+        return
+    rows = list(_pending)
+    _pending.clear()
+    _ensure_schema()
+    with db.atomic():
+        Toast.insert_many(rows).execute()
+
+
+def flush_toasts():
+    """
+    Drain buffered toasts immediately. Called on shutdown, where the
+    toasts still inside the debounce window (capture errors right
+    before exit) are exactly the ones worth keeping.
+    """
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    _flush_pending()
+
+
 def add_toast(
         title: str,
         body: str,
         duration: int = 800
 ):
-    Toast.create(
-        title=title,
-        body=body,
-        duration=duration
-    )
-
-
-Toast.create_table()
\ No newline at end of file
+    global _flush_handle
+    row = {
+        'title': title,
+        'body': body,
+        'duration': duration
+    }
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop to debounce on (startup, shutdown): write through.
+        _pending.append(row)
+        _flush_pending()
+        return
+    _pending.append(row)
+    if _flush_handle is None:
+        _flush_handle = loop.call_later(_FLUSH_DELAY, _flush_pending)
\ No newline at end of file